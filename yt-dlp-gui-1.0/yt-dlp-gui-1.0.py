@@ -4,6 +4,11 @@ import sys
 import os
 import json
 import re
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                             QTextEdit, QComboBox, QFileDialog, QGroupBox,
@@ -13,95 +18,359 @@ from PyQt5.QtCore import QThread, pyqtSignal, QProcess, Qt, QUrl
 from PyQt5.QtGui import QFont, QTextCursor, QPixmap, QDesktopServices
 import subprocess
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 __version__ = "1.0.0"
 __author__ = "Your Name"
 __license__ = "MIT"
 
+class ContentIndex:
+    """Index of finished files keyed by video ID and content hash"""
+    
+    FILENAME = '.yt-dlp-gui-index.json'
+    CHUNK_SIZE = 1024 * 1024
+    FICLONE = 0x40049409  # Linux ioctl for copy-on-write clones
+    
+    def __init__(self, directory):
+        self.path = os.path.join(directory, self.FILENAME)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+    
+    @classmethod
+    def hash_file(cls, path):
+        """SHA-256 of a file, read in fixed-size chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @classmethod
+    def link(cls, source, target):
+        """Replace target with a hardlink or reflink to source, returning the method used"""
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(target)}.link")
+        try:
+            os.link(source, tmp_path)
+            method = 'hardlink'
+        except OSError:
+            if fcntl is None:
+                return None
+            try:
+                with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), cls.FICLONE, src.fileno())
+                method = 'reflink'
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+        try:
+            os.replace(tmp_path, target)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+        return method
+    
+    def lookup(self, key):
+        """Return the stored path for key, dropping the entry if the file changed"""
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        try:
+            if os.path.getsize(entry['path']) == entry['size']:
+                return entry['path']
+        except OSError:
+            pass
+        del self.entries[key]
+        return None
+    
+    def find_by_hash(self, sha256, size):
+        for key, entry in list(self.entries.items()):
+            if entry['sha256'] == sha256 and entry['size'] == size and self.lookup(key):
+                return entry['path']
+        return None
+    
+    def add(self, key, path):
+        """Record a finished file; if identical content is already stored, link to it"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        
+        # yt-dlp reports files that were already downloaded too; skip re-hashing them
+        entry = self.entries.get(key)
+        if (entry and entry['size'] == stat.st_size and entry.get('mtime') == stat.st_mtime
+                and os.path.exists(entry['path']) and os.path.samefile(entry['path'], path)):
+            return None, None
+        
+        size = stat.st_size
+        sha256 = self.hash_file(path)
+        
+        source = self.find_by_hash(sha256, size)
+        method = None
+        if source and not os.path.samefile(source, path):
+            method = self.link(source, path)
+        
+        # Keep the first stored copy, refreshing its cached mtime if this is the same file
+        existing = self.lookup(key)
+        if not existing or os.path.samefile(existing, path):
+            self.entries[key] = {'path': existing or path, 'sha256': sha256, 'size': size,
+                                 'mtime': os.stat(path).st_mtime}
+        return source, method
+
+def format_size(size):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+    return f"{minutes}m{seconds:02d}s"
+
+class QueueItem:
+    def __init__(self, url, position):
+        self.url = url
+        self.position = position  # Order in the input list
+        self.priority = 0
+        self.front = 0  # Non-zero once moved to the front; later moves go first
+        self.size = None
+        self.duration = None
+        self.entries = None  # (extractor, id, filename) planned by the probe
+        self.probing = False
+        self.probed = threading.Event()
+        self.done = False
+    
+    def describe(self):
+        text = f"[P{self.priority}] {self.url}"
+        details = []
+        if self.size:
+            details.append(f"~{format_size(self.size)}")
+        if self.duration:
+            details.append(format_duration(self.duration))
+        if details:
+            text += f"  ({', '.join(details)})"
+        return text
+
+class BatchScheduler:
+    """Chooses which queued URL to download next and tracks batch metrics"""
+    
+    POLICIES = {
+        'Input order': 'input',
+        'Shortest first': 'shortest',
+        'Fair mix': 'fair',
+    }
+    
+    def __init__(self, urls, policy='input'):
+        self.items = [QueueItem(url, i) for i, url in enumerate(urls)]
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.front_counter = 0
+        self.take_large = False  # Fair mix alternates between the small and large ends
+        self.started_at = time.monotonic()
+        self.completions = []  # (seconds since start, estimated size, succeeded)
+    
+    def start(self):
+        self.started_at = time.monotonic()
+    
+    def inherit(self, other, keep_front=True):
+        """Carry priorities, and optionally front moves, over from another queue by URL"""
+        settings = {}
+        with other.lock:
+            for item in other.items:
+                settings.setdefault(item.url, (item.priority, item.front if keep_front else 0))
+            front_counter = other.front_counter if keep_front else 0
+        with self.lock:
+            self.front_counter = front_counter
+            for item in self.items:
+                item.priority, item.front = settings.get(item.url, (0, 0))
+    
+    def cost(self, item, rate):
+        """Estimated bytes, falling back to duration times the batch's average bitrate"""
+        if item.size:
+            return item.size
+        if item.duration and rate:
+            return item.duration * rate
+        return None
+    
+    def byte_rate(self):
+        known = [item for item in self.items if item.size and item.duration]
+        duration = sum(item.duration for item in known)
+        return sum(item.size for item in known) / duration if duration else None
+    
+    def order_group(self, group, rate):
+        if self.policy == 'input':
+            return sorted(group, key=lambda item: item.position)
+        
+        # Unknown sizes go last, in input order
+        known = sorted((item for item in group if self.cost(item, rate) is not None),
+                       key=lambda item: (self.cost(item, rate), item.position))
+        unknown = sorted((item for item in group if self.cost(item, rate) is None),
+                         key=lambda item: item.position)
+        if self.policy == 'shortest':
+            return known + unknown
+        
+        mixed = []
+        take_large = self.take_large
+        while known:
+            mixed.append(known.pop() if take_large else known.pop(0))
+            take_large = not take_large
+        return mixed + unknown
+    
+    def ordered(self):
+        """Pending items in the order they will be downloaded"""
+        with self.lock:
+            return self._ordered()
+    
+    def _ordered(self):
+        pending = [item for item in self.items if not item.done]
+        result = sorted((item for item in pending if item.front), key=lambda item: -item.front)
+        rest = [item for item in pending if not item.front]
+        rate = self.byte_rate()
+        for priority in sorted({item.priority for item in rest}, reverse=True):
+            result += self.order_group([item for item in rest if item.priority == priority], rate)
+        return result
+    
+    def next_item(self):
+        with self.lock:
+            ordered = self._ordered()
+            if not ordered:
+                return None
+            item = ordered[0]
+            item.done = True
+            if self.policy == 'fair' and not item.front:
+                self.take_large = not self.take_large
+            return item
+    
+    def set_estimate(self, item, size, duration, entries):
+        with self.lock:
+            item.size = size or None
+            item.duration = duration or None
+            item.entries = entries
+        item.probed.set()
+    
+    def change_priority(self, position, delta):
+        with self.lock:
+            # An explicit priority replaces any earlier move to the front
+            self.items[position].priority += delta
+            self.items[position].front = 0
+    
+    def move_to_front(self, position):
+        with self.lock:
+            self.front_counter += 1
+            self.items[position].front = self.front_counter
+    
+    def record_completion(self, item, succeeded):
+        with self.lock:
+            self.completions.append((time.monotonic() - self.started_at, item.size or 0, succeeded))
+    
+    def report(self):
+        """Throughput and mean time-to-completion for the finished items"""
+        with self.lock:
+            if not self.completions:
+                return None
+            elapsed = time.monotonic() - self.started_at
+            succeeded = [c for c in self.completions if c[2]]
+            total_bytes = sum(c[1] for c in succeeded)
+            mean_ttc = sum(c[0] for c in self.completions) / len(self.completions)
+            policy = next(name for name, key in self.POLICIES.items() if key == self.policy)
+        
+        lines = [f"📊 Schedule: {policy}",
+                 f"   Finished {len(succeeded)}/{len(self.completions)} items in {format_duration(elapsed)}",
+                 f"   Throughput: {len(succeeded) / elapsed * 60:.2f} items/min"]
+        if total_bytes:
+            lines[-1] += f", ~{format_size(total_bytes / elapsed)}/s (estimated sizes)"
+        lines.append(f"   Mean time to completion: {format_duration(mean_ttc)}")
+        return '\n'.join(lines) + '\n'
+
 class DownloadThread(QThread):
     # Signals to communicate with main thread
     progress = pyqtSignal(str)
     progress_percent = pyqtSignal(int)
     finished = pyqtSignal()
     error = pyqtSignal(str)
+    queue_changed = pyqtSignal()
+    
+    ESTIMATE_JOBS = 4  # Metadata probes run in parallel
+    # One line per entry; serves both size estimates and dedup planning
+    PROBE_TEMPLATE = '%(filesize,filesize_approx|0)s\t%(duration|0)s\t%(extractor_key)s\t%(id)s\t%(filename)s'
     
-    def __init__(self, urls, options):
+    def __init__(self, urls, options, scheduler=None):
         super().__init__()
         self.urls = urls if isinstance(urls, list) else [urls]
         self.options = options
+        self.scheduler = scheduler or BatchScheduler(self.urls)
         self.process = None
+        self.probes = []
+        self.probing = False
+        self.probe_lock = threading.Lock()  # Guards probes against stop_probing
+        self.first_probes_done = threading.Event()
         self.is_cancelled = False
         
     def run(self):
+        index = None
+        work_dir = None
+        self.scheduler.start()
         try:
-            for i, url in enumerate(self.urls):
+            # Content index of finished files, shared by every playlist under the output path
+            if self.options.get('deduplicate'):
+                output_path = self.options.get('output_path', os.path.expanduser("~/Downloads"))
+                index = ContentIndex(output_path)
+                work_dir = tempfile.mkdtemp(prefix='yt-dlp-gui-')
+                archive_path = os.path.join(work_dir, 'archive.txt')
+                finished_path = os.path.join(work_dir, 'finished.txt')
+            
+            # Size-aware policies start once the first probes return; the rest are probed meanwhile
+            if self.scheduler.policy != 'input' and len(self.urls) > 1:
+                self.progress.emit(f"\n📏 Estimating sizes for {len(self.urls)} URLs...\n")
+                self.probing = True
+                threading.Thread(target=self.estimate_sizes, daemon=True).start()
+                self.first_probes_done.wait()
+            
+            for i in range(len(self.urls)):
                 if self.is_cancelled:
                     self.progress.emit("\n⚠️ Download cancelled by user\n")
                     break
-                    
-                self.progress.emit(f"\n📥 Downloading {i+1}/{len(self.urls)}: {url}\n")
-                
-                # Build command
-                cmd = ['yt-dlp']
                 
-                # Add progress template for parsing
-                cmd.extend(['--newline', '--progress'])
-                
-                # Quality/format selection
-                format_option = self.options.get('format', 'best')
-                if format_option == 'best':
-                    if self.options.get('prefer_free_formats'):
-                        cmd.extend(['-f', 'bv*+ba/b'])
-                    else:
-                        cmd.extend(['-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'])
-                elif format_option == 'worst':
-                    cmd.extend(['-f', 'worstvideo+worstaudio/worst'])
-                elif format_option == 'bestaudio':
-                    cmd.extend(['-f', 'bestaudio/best'])
-                else:
-                    # Specific quality like 1080p, 720p, etc.
-                    quality = format_option.replace('p', '')
-                    cmd.extend(['-f', f'bestvideo[height<={quality}]+bestaudio/best[height<={quality}]'])
-                
-                # Output format conversion
-                output_format = self.options.get('output_format', 'default')
-                if output_format != 'default':
-                    if output_format in ['mp3', 'wav', 'flac', 'm4a', 'opus']:
-                        # Audio formats
-                        cmd.extend(['-x', '--audio-format', output_format])
-                        if output_format == 'mp3':
-                            cmd.extend(['--audio-quality', '0'])  # Best quality
-                    else:
-                        # Video format conversion
-                        cmd.extend(['--remux-video', output_format])
-                
-                # Playlist handling
-                if not self.options.get('download_playlist', True):
-                    cmd.append('--no-playlist')
-                
-                # Output path and filename template
-                output_path = self.options.get('output_path', os.path.expanduser("~/Downloads"))
-                if self.options.get('download_playlist', True):
-                    # Create playlist folder
-                    output_template = os.path.join(output_path, '%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s')
-                else:
-                    output_template = os.path.join(output_path, '%(title)s.%(ext)s')
-                cmd.extend(['-o', output_template])
+                item = self.scheduler.next_item()
+                if item is None:
+                    break
+                url = item.url
+                self.queue_changed.emit()
                 
-                # Subtitles
-                if self.options.get('subtitles'):
-                    cmd.extend(['--write-sub', '--write-auto-sub', '--sub-lang', 'en,es,fr,de,ja'])
-                    if self.options.get('embed_subs'):
-                        cmd.append('--embed-subs')
+                self.progress.emit(f"\n📥 Downloading {i+1}/{len(self.urls)}: {url}\n")
                 
-                # Thumbnail
-                if self.options.get('thumbnail'):
-                    cmd.append('--write-thumbnail')
-                    if self.options.get('embed_thumbnail'):
-                        cmd.append('--embed-thumbnail')
+                cmd = self.build_command()
                 
-                # Additional options
-                if self.options.get('keep_video'):
-                    cmd.append('-k')
+                # Link files already in the content index instead of fetching them
+                if index is not None:
+                    if self.can_link_planned(index):
+                        # Reuse the size probe's plan rather than extracting the URL again
+                        if item.probing:
+                            item.probed.wait()
+                        if self.link_indexed(cmd + [url], index, archive_path, item.entries):
+                            cmd.extend(['--download-archive', archive_path])
+                    cmd.extend(['--print-to-file', 'after_move:%(extractor_key)s\t%(id)s\t%(filepath)s',
+                                finished_path.replace('%', '%%')])
+                    if self.is_cancelled:
+                        self.progress.emit("\n⚠️ Download cancelled by user\n")
+                        break
                 
                 # Add URL
                 cmd.append(url)
@@ -120,16 +389,246 @@ class DownloadThread(QThread):
                     self.progress.emit(f"⏹️ Stopped: {url}\n")
                 elif self.process.exitCode() != 0:
                     self.error.emit(f"Download failed for {url} with exit code: {self.process.exitCode()}")
+                    self.scheduler.record_completion(item, False)
                 else:
                     self.progress.emit(f"\n✅ Completed: {url}\n")
+                    self.scheduler.record_completion(item, True)
+                
+                # Index whatever finished, even if part of a playlist failed
+                if index is not None:
+                    self.index_finished(finished_path, index)
                 
         except Exception as e:
             self.error.emit(f"Error: {str(e)}")
         finally:
+            self.stop_probing()
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
             if not self.is_cancelled:
                 self.progress.emit("\n🎉 All downloads completed!")
+            if len(self.urls) > 1:
+                report = self.scheduler.report()
+                if report:
+                    self.progress.emit("\n" + report)
             self.finished.emit()
     
+    def estimate_sizes(self):
+        """Probe estimated sizes and durations without downloading, a few URLs at a time"""
+        try:
+            for start in range(0, len(self.scheduler.items), self.ESTIMATE_JOBS):
+                if not self.probing:
+                    return
+                
+                # Items already dispatched no longer need an estimate
+                group = [item for item in self.scheduler.items[start:start + self.ESTIMATE_JOBS]
+                         if not item.done]
+                for item in group:
+                    # Same format options, so sizes and filenames match what will be fetched
+                    cmd = self.build_command() + ['--simulate', '--ignore-errors', '--print',
+                                                  self.PROBE_TEMPLATE, item.url]
+                    with self.probe_lock:
+                        if not self.probing:
+                            break
+                        self.probes.append((item, subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                                                   stderr=subprocess.DEVNULL,
+                                                                   text=True, errors='replace')))
+                        item.probing = True
+                
+                for item, process in list(self.probes):
+                    output, _ = process.communicate()
+                    self.scheduler.set_estimate(item, *self.parse_probe(output))
+                with self.probe_lock:
+                    self.probes = []
+                self.queue_changed.emit()
+                self.first_probes_done.set()
+        except OSError as e:
+            self.progress.emit(f"Could not estimate sizes: {e}\n")
+        finally:
+            # Don't leave the download loop waiting on a probe that never finished
+            for item, _ in self.probes:
+                item.probed.set()
+            self.first_probes_done.set()
+    
+    def parse_probe(self, output):
+        """Total size and duration plus the planned entries from PROBE_TEMPLATE output"""
+        size = duration = 0
+        entries = []
+        # Playlists print one line per entry
+        for line in output.splitlines():
+            parts = line.split('\t')
+            if len(parts) != 5:
+                continue
+            try:
+                size += float(parts[0])
+                duration += float(parts[1])
+            except ValueError:
+                pass
+            entries.append(tuple(parts[2:]))
+        return size, duration, entries
+    
+    def stop_probing(self):
+        with self.probe_lock:
+            self.probing = False
+            for _, process in self.probes:
+                if process.poll() is None:
+                    process.kill()
+    
+    def build_command(self):
+        """Build the yt-dlp command for the current options, without the URL"""
+        cmd = ['yt-dlp']
+        
+        # Add progress template for parsing
+        cmd.extend(['--newline', '--progress'])
+        
+        # Quality/format selection
+        format_option = self.options.get('format', 'best')
+        if format_option == 'best':
+            if self.options.get('prefer_free_formats'):
+                cmd.extend(['-f', 'bv*+ba/b'])
+            else:
+                cmd.extend(['-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'])
+        elif format_option == 'worst':
+            cmd.extend(['-f', 'worstvideo+worstaudio/worst'])
+        elif format_option == 'bestaudio':
+            cmd.extend(['-f', 'bestaudio/best'])
+        else:
+            # Specific quality like 1080p, 720p, etc.
+            quality = format_option.replace('p', '')
+            cmd.extend(['-f', f'bestvideo[height<={quality}]+bestaudio/best[height<={quality}]'])
+        
+        # Output format conversion
+        output_format = self.options.get('output_format', 'default')
+        if output_format != 'default':
+            if output_format in ['mp3', 'wav', 'flac', 'm4a', 'opus']:
+                # Audio formats
+                cmd.extend(['-x', '--audio-format', output_format])
+                if output_format == 'mp3':
+                    cmd.extend(['--audio-quality', '0'])  # Best quality
+            else:
+                # Video format conversion
+                cmd.extend(['--remux-video', output_format])
+        
+        # Playlist handling
+        if not self.options.get('download_playlist', True):
+            cmd.append('--no-playlist')
+        
+        # Output path and filename template
+        output_path = self.options.get('output_path', os.path.expanduser("~/Downloads"))
+        if self.options.get('download_playlist', True):
+            # Create playlist folder
+            output_template = os.path.join(output_path, '%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s')
+        else:
+            output_template = os.path.join(output_path, '%(title)s.%(ext)s')
+        cmd.extend(['-o', output_template])
+        
+        # Subtitles
+        if self.options.get('subtitles'):
+            cmd.extend(['--write-sub', '--write-auto-sub', '--sub-lang', 'en,es,fr,de,ja'])
+            if self.options.get('embed_subs'):
+                cmd.append('--embed-subs')
+        
+        # Thumbnail
+        if self.options.get('thumbnail'):
+            cmd.append('--write-thumbnail')
+            if self.options.get('embed_thumbnail'):
+                cmd.append('--embed-thumbnail')
+        
+        # Additional options
+        if self.options.get('keep_video'):
+            cmd.append('-k')
+        
+        return cmd
+    
+    def content_variant(self):
+        """Options that change the bytes of a finished file"""
+        return '|'.join([
+            self.options.get('format', 'best'),
+            self.options.get('output_format', 'default'),
+            'free' if self.options.get('prefer_free_formats') else '',
+            'subs' if self.options.get('subtitles') and self.options.get('embed_subs') else '',
+            'thumb' if self.options.get('thumbnail') and self.options.get('embed_thumbnail') else '',
+        ])
+    
+    def index_key(self, extractor, video_id):
+        return f"{extractor.lower()} {video_id} {self.content_variant()}"
+    
+    def can_link_planned(self, index):
+        """Whether planned downloads may be satisfied from the index"""
+        # Nothing to link into a fresh output folder
+        if not index.entries:
+            return False
+        # Archived entries are skipped entirely, so their sidecar files would never be written
+        return not (self.options.get('subtitles') or self.options.get('thumbnail')
+                    or self.options.get('keep_video'))
+    
+    def link_indexed(self, cmd, index, archive_path, entries=None):
+        """Link planned downloads that are already indexed, returning True if any were"""
+        if entries is None:
+            # Resolve the planned IDs and filenames without fetching any media
+            plan_cmd = cmd[:-1] + ['--simulate', '--ignore-errors', '--print',
+                                   self.PROBE_TEMPLATE, cmd[-1]]
+            self.process = QProcess()
+            self.process.start(plan_cmd[0], plan_cmd[1:])
+            self.process.waitForFinished(-1)
+            if self.is_cancelled:
+                return False
+            output = self.process.readAllStandardOutput().data().decode('utf-8', 'replace')
+            entries = self.parse_probe(output)[2]
+        
+        archive = []
+        for extractor, video_id, filename in entries:
+            source = index.lookup(self.index_key(extractor, video_id))
+            if not source:
+                continue
+            
+            # Post-processing may change the extension, so take it from the stored copy
+            target = os.path.abspath(os.path.splitext(filename)[0] + os.path.splitext(source)[1])
+            try:
+                if os.path.exists(target):
+                    if not os.path.samefile(source, target):
+                        continue
+                else:
+                    method = ContentIndex.link(source, target)
+                    if not method:
+                        continue
+                    self.progress.emit(f"🔗 Linked {video_id} ({method}): {target}\n")
+            except OSError as e:
+                # Left out of the archive, so yt-dlp downloads it normally
+                self.progress.emit(f"Could not link {target}: {e}\n")
+                continue
+            archive.append(f"{extractor.lower()} {video_id}")
+        
+        # Rewritten per URL so yt-dlp only skips entries that were actually linked
+        with open(archive_path, 'w') as f:
+            f.write(''.join(entry + '\n' for entry in archive))
+        return bool(archive)
+    
+    def index_finished(self, finished_path, index):
+        """Add files reported by yt-dlp to the index, linking duplicates"""
+        try:
+            with open(finished_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            os.remove(finished_path)
+        except OSError:
+            return
+        
+        for line in lines:
+            parts = line.split('\t')
+            if len(parts) != 3 or not os.path.isfile(parts[2]):
+                continue
+            extractor, video_id, filepath = parts
+            try:
+                source, method = index.add(self.index_key(extractor, video_id), filepath)
+            except OSError as e:
+                self.progress.emit(f"Could not index {filepath}: {e}\n")
+                continue
+            if method:
+                self.progress.emit(f"🔗 Duplicate of {source} ({method}): {filepath}\n")
+        try:
+            index.save()
+        except OSError as e:
+            self.progress.emit(f"Could not save content index: {e}\n")
+    
     def handle_output(self):
         data = self.process.readAllStandardOutput().data().decode('utf-8')
         self.progress.emit(data)
@@ -147,6 +646,7 @@ class DownloadThread(QThread):
     
     def stop(self):
         self.is_cancelled = True
+        self.stop_probing()
         if self.process and self.process.state() != QProcess.NotRunning:
             self.process.terminate()
             if not self.process.waitForFinished(5000):
@@ -289,6 +789,11 @@ class YTDLPGui(QMainWindow):
         self.keep_video_checkbox = QCheckBox("Keep original video (when converting)")
         checkbox_row2.addWidget(self.keep_video_checkbox)
         
+        self.dedupe_checkbox = QCheckBox("Link duplicates across playlists")
+        self.dedupe_checkbox.setToolTip("Store each video once and hardlink/reflink repeats "
+                                        "instead of downloading them again")
+        checkbox_row2.addWidget(self.dedupe_checkbox)
+        
         checkbox_row2.addStretch()
         options_layout.addLayout(checkbox_row2)
         
@@ -333,6 +838,7 @@ class YTDLPGui(QMainWindow):
                                           "https://youtube.com/watch?v=...\n"
                                           "https://youtube.com/playlist?list=...")
         self.batch_urls.setMaximumHeight(150)
+        self.batch_urls.textChanged.connect(self.update_batch_queue)
         url_layout.addWidget(self.batch_urls)
         
         # Batch controls
@@ -352,6 +858,42 @@ class YTDLPGui(QMainWindow):
         # Use same options as single tab (we'll reference them)
         layout.addWidget(QLabel("Options from Single Download tab will be used"))
         
+        # Scheduling policy
+        schedule_row = QHBoxLayout()
+        schedule_row.addWidget(QLabel("Download order:"))
+        self.schedule_combo = QComboBox()
+        self.schedule_combo.addItems(list(BatchScheduler.POLICIES))
+        self.schedule_combo.setToolTip("Shortest first and Fair mix estimate sizes from metadata as the batch runs")
+        self.schedule_combo.setMaximumWidth(150)
+        self.schedule_combo.currentTextChanged.connect(self.on_schedule_changed)
+        schedule_row.addWidget(self.schedule_combo)
+        schedule_row.addStretch()
+        layout.addLayout(schedule_row)
+        
+        # Pending queue; priorities can be set before and during the batch
+        self.batch_scheduler = BatchScheduler([])
+        self.batch_running = False
+        queue_group = QGroupBox("Queue")
+        queue_layout = QVBoxLayout()
+        self.queue_list = QListWidget()
+        self.queue_list.setMaximumHeight(120)
+        queue_layout.addWidget(self.queue_list)
+        
+        queue_controls = QHBoxLayout()
+        self.move_front_button = QPushButton("Move to Front")
+        self.move_front_button.clicked.connect(self.move_queue_item_to_front)
+        self.priority_up_button = QPushButton("Priority +")
+        self.priority_up_button.clicked.connect(lambda: self.change_queue_priority(1))
+        self.priority_down_button = QPushButton("Priority -")
+        self.priority_down_button.clicked.connect(lambda: self.change_queue_priority(-1))
+        for button in (self.move_front_button, self.priority_up_button, self.priority_down_button):
+            queue_controls.addWidget(button)
+        queue_controls.addStretch()
+        queue_layout.addLayout(queue_controls)
+        
+        queue_group.setLayout(queue_layout)
+        layout.addWidget(queue_group)
+        
         # Control buttons for batch
         self.init_control_buttons(layout, batch=True)
         
@@ -402,6 +944,8 @@ class YTDLPGui(QMainWindow):
                     <li>Quality selection (up to 4K)</li>
                     <li>Format conversion (video & audio)</li>
                     <li>Playlist download support</li>
+                    <li>Duplicate linking across playlists</li>
+                    <li>Size-aware batch scheduling with priorities</li>
                     <li>Subtitle and thumbnail embedding</li>
                     <li>Progress tracking</li>
                 </ul>
@@ -590,6 +1134,7 @@ class YTDLPGui(QMainWindow):
             'thumbnail': self.thumbnail_checkbox.isChecked(),
             'embed_thumbnail': self.embed_thumb_checkbox.isChecked(),
             'keep_video': self.keep_video_checkbox.isChecked(),
+            'deduplicate': self.dedupe_checkbox.isChecked(),
         }
     
     def start_download(self):
@@ -600,16 +1145,21 @@ class YTDLPGui(QMainWindow):
         
         self.run_download([url])
     
-    def start_batch_download(self):
-        urls = [url.strip() for url in self.batch_urls.toPlainText().split('\n') 
+    def get_batch_urls(self):
+        return [url.strip() for url in self.batch_urls.toPlainText().split('\n') 
                 if url.strip()]
+    
+    def start_batch_download(self):
+        urls = self.get_batch_urls()
         if not urls:
             QMessageBox.warning(self, "No URLs", "Please enter at least one URL")
             return
         
-        self.run_download(urls)
+        self.batch_running = True
+        self.schedule_combo.setEnabled(False)
+        self.run_download(urls, self.batch_scheduler)
     
-    def run_download(self, urls):
+    def run_download(self, urls, scheduler=None):
         # Clear output and show progress bar
         self.output_text.clear()
         self.progress_bar.setVisible(True)
@@ -623,13 +1173,52 @@ class YTDLPGui(QMainWindow):
         
         # Get options and create thread
         options = self.get_download_options()
-        self.download_thread = DownloadThread(urls, options)
+        self.download_thread = DownloadThread(urls, options, scheduler)
         self.download_thread.progress.connect(self.update_output)
         self.download_thread.progress_percent.connect(self.update_progress)
         self.download_thread.finished.connect(self.download_finished)
         self.download_thread.error.connect(self.download_error)
+        if scheduler:
+            self.download_thread.queue_changed.connect(self.refresh_queue)
         self.download_thread.start()
     
+    def update_batch_queue(self, keep_front=True):
+        """Rebuild the pending queue from the URL list, keeping assigned priorities"""
+        if self.batch_running:
+            return
+        scheduler = BatchScheduler(self.get_batch_urls(),
+                                   BatchScheduler.POLICIES[self.schedule_combo.currentText()])
+        scheduler.inherit(self.batch_scheduler, keep_front)
+        self.batch_scheduler = scheduler
+        self.refresh_queue()
+    
+    def on_schedule_changed(self, text):
+        self.batch_scheduler.policy = BatchScheduler.POLICIES[text]
+        self.refresh_queue()
+    
+    def refresh_queue(self):
+        selected = self.queue_list.currentItem()
+        selected_position = selected.data(Qt.UserRole) if selected else None
+        self.queue_list.clear()
+        for item in self.batch_scheduler.ordered():
+            list_item = QListWidgetItem(item.describe())
+            list_item.setData(Qt.UserRole, item.position)
+            self.queue_list.addItem(list_item)
+            if item.position == selected_position:
+                self.queue_list.setCurrentItem(list_item)
+    
+    def move_queue_item_to_front(self):
+        selected = self.queue_list.currentItem()
+        if selected:
+            self.batch_scheduler.move_to_front(selected.data(Qt.UserRole))
+            self.refresh_queue()
+    
+    def change_queue_priority(self, delta):
+        selected = self.queue_list.currentItem()
+        if selected:
+            self.batch_scheduler.change_priority(selected.data(Qt.UserRole), delta)
+            self.refresh_queue()
+    
     def stop_download(self):
         if self.download_thread and self.download_thread.isRunning():
             reply = QMessageBox.question(self, 'Stop Download',
@@ -656,6 +1245,11 @@ class YTDLPGui(QMainWindow):
         self.stop_button.setEnabled(False)
         self.batch_stop_button.setEnabled(False)
         self.progress_bar.setVisible(False)
+        if self.batch_running:
+            self.batch_running = False
+            self.schedule_combo.setEnabled(True)
+            # Front moves only apply to the batch they were made in
+            self.update_batch_queue(keep_front=False)
     
     def download_error(self, error_msg):
         self.output_text.append(f"\n❌ Error: {error_msg}")